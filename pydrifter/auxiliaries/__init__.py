@@ -1 +1,2 @@
-from .custom_warnings import *
\ No newline at end of file
+from .custom_warnings import *
+from .table_format import *
@@ -0,0 +1,12 @@
+def format_table(rows: list[list], headers: list[str]) -> str:
+    """Render rows as a plain-text grid in the style of tabulate's "pretty" format."""
+    header_cells = [str(header) for header in headers]
+    cells = [[str(value) for value in row] for row in rows]
+    widths = [max(map(len, column)) for column in zip(header_cells, *cells)]
+
+    border = "+" + "+".join("-" * (width + 2) for width in widths) + "+"
+
+    def line(values: list[str]) -> str:
+        return "| " + " | ".join(value.center(width) for value, width in zip(values, widths)) + " |"
+
+    return "\n".join([border, line(header_cells), border, *map(line, cells), border])
@@ -1,22 +1,144 @@
 import dataclasses
+import datetime
+import logging
 import numpy as np
 import pandas as pd
 from abc import ABC, abstractmethod
-import pendulum
+from typing import ClassVar
+
+from pydrifter.logger import create_logger
+
+logger = create_logger(name="base_statistics.py", level="info")
+
+# (conclusion, log mark) indexed by whether the test failed
+_VERDICTS = (("OK", " ✅ OK"), ("FAILED", " ⚠️ FAILED"))
+
+# Columns of a test report row, in the order produced by `BaseStatisticalTest.report_row`
+REPORT_COLUMNS = [
+    "test_datetime",
+    "model_version",
+    "feature_name",
+    "feature_type",
+    "control_mean",
+    "treatment_mean",
+    "control_std",
+    "treatment_std",
+    "quantile_cut",
+    "test_name",
+    "p_value",
+    "left_ci",
+    "right_ci",
+    "statistics",
+    "conclusion",
+]
+
+@dataclasses.dataclass
+class FeatureStats:
+    mean: float
+    std: float
+    var: float
+    min: float
+    max: float
+
+    @classmethod
+    def empty(cls) -> "FeatureStats":
+        """Statistics of an empty sample, e.g. a constant column removed entirely by the quantile cut."""
+        # NumPy NaN, so arithmetic on the empty statistics yields NaN instead of ZeroDivisionError
+        nan = np.float64(np.nan)
+        return cls(mean=nan, std=nan, var=nan, min=nan, max=nan)
+
+    @classmethod
+    def from_data(cls, data: pd.Series | np.ndarray) -> "FeatureStats":
+        data = np.asarray(data, dtype=np.float64)
+        if data.size == 0:
+            return cls.empty()
+        mean, var = cls._moments(data)
+        return cls(mean=mean, std=np.sqrt(var), var=var, min=data.min(), max=data.max())
+
+    @classmethod
+    def from_sorted(cls, sorted_data: np.ndarray) -> "FeatureStats":
+        """Same statistics for sorted data: min and max are the end points."""
+        sorted_data = np.asarray(sorted_data, dtype=np.float64)
+        if sorted_data.size == 0:
+            return cls.empty()
+        mean, var = cls._moments(sorted_data)
+        return cls(mean=mean, std=np.sqrt(var), var=var, min=sorted_data[0], max=sorted_data[-1])
+
+    @staticmethod
+    def _moments(data: np.ndarray) -> tuple[float, float]:
+        # Mean and variance from one deviation pass; ddof=1 to match pandas Series.std/var used in reports so far
+        mean = data.sum() / data.size
+        deviations = data - mean
+        var = np.dot(deviations, deviations) / (data.size - 1) if data.size > 1 else np.float64(np.nan)
+        return mean, var
+
 
 @dataclasses.dataclass
 class StatTestResult:
-    dataframe: pd.DataFrame
+    row: dict
     value: float
     conclusion: str = None
 
+    @property
+    def dataframe(self) -> pd.DataFrame:
+        return pd.DataFrame([self.row])
+
+
+def results_to_frame(results: list[StatTestResult]) -> pd.DataFrame:
+    """Build a single report DataFrame from a list of test results."""
+    return pd.DataFrame.from_records([result.row for result in results], columns=REPORT_COLUMNS)
+
+
+def _quantile_threshold(lower_value: float, upper_value: float, weight: float) -> float:
+    # Same interpolation formula as np.quantile, so the threshold matches bit for bit
+    if weight >= 0.5:
+        return upper_value - (upper_value - lower_value) * (1 - weight)
+    return lower_value + (upper_value - lower_value) * weight
+
+
+def quantile_cut(data: pd.Series | np.ndarray, q: bool | float) -> np.ndarray:
+    """Keep values below the `q` quantile (linear interpolation, as in pandas)."""
+    data = np.asarray(data)
+    if not q or data.size == 0:
+        return data
+
+    position = q * (data.size - 1)
+    lower = int(np.floor(position))
+    upper = min(lower + 1, data.size - 1)
+    partitioned = np.partition(data, [lower, upper])
+    threshold = _quantile_threshold(partitioned[lower], partitioned[upper], position - lower)
+    return data[data < threshold]
+
+
+def quantile_cut_sorted(sorted_data: np.ndarray, q: bool | float) -> np.ndarray:
+    """Same as `quantile_cut` for already sorted data: the threshold is an O(1) lookup and the result stays sorted."""
+    if not q or sorted_data.size == 0:
+        return sorted_data
+
+    position = q * (sorted_data.size - 1)
+    lower = int(np.floor(position))
+    upper = min(lower + 1, sorted_data.size - 1)
+    threshold = _quantile_threshold(sorted_data[lower], sorted_data[upper], position - lower)
+    return sorted_data[:np.searchsorted(sorted_data, threshold, side="left")]
+
 
 class BaseStatisticalTest(ABC):
+    # Subclasses are slotted dataclasses; an empty base __slots__ keeps instances free of a __dict__
+    __slots__ = ()
+
+    # Whether the test runs on (or is much faster with) sorted samples, so callers should pass
+    # `sorted_control`/`sorted_treatment` even without a quantile cut
+    uses_sorted_data: ClassVar[bool] = False
+
     control_data: np.ndarray
     treatment_data: np.ndarray
     feature_name: str = "UNKNOWN_FEATURE"
     alpha: float = 0.1
     q: bool | float = False
+    control_stats: FeatureStats | None = None
+    treatment_stats: FeatureStats | None = None
+    sorted_control: np.ndarray | None = None
+    sorted_treatment: np.ndarray | None = None
 
     @property
     @abstractmethod
@@ -29,13 +151,29 @@ class BaseStatisticalTest(ABC):
         """Run statistical test and return result."""
         pass
 
-    def _apply_quantile_cut(self, data: pd.Series | np.ndarray) -> pd.Series:
-        """Apply quantile cut if self.q is set."""
-        if not isinstance(data, pd.Series):
-            data = pd.Series(data)
-        return data[data < data.quantile(self.q)] if self.q else data
+    def _apply_quantile_cut(self, data: pd.Series | np.ndarray, sorted_data: np.ndarray | None = None) -> np.ndarray:
+        """Apply quantile cut if self.q is set. Presorted data is cut without another pass and stays sorted."""
+        if sorted_data is not None:
+            return quantile_cut_sorted(sorted_data, self.q)
+        return quantile_cut(data, self.q)
+
+    def _conclude(self, failed: bool) -> str:
+        """Log the verdict for this feature and return the conclusion string."""
+        conclusion, mark = _VERDICTS[bool(failed)]
+        if logger.isEnabledFor(logging.INFO):
+            message = f"{self.__name__} for '{self.feature_name}'"
+            # Padding to 50 characters, same as str.ljust(50, "."), interpolated by the logger
+            logger.info("%s%s%s", message, "." * (50 - len(message)), mark)
+        return conclusion
 
-    def dataframe_report(
+    def _feature_stats(self, control: np.ndarray, treatment: np.ndarray) -> tuple[FeatureStats, FeatureStats]:
+        """Return precomputed feature statistics or compute them from the data."""
+        return (
+            self.control_stats or FeatureStats.from_data(control),
+            self.treatment_stats or FeatureStats.from_data(treatment),
+        )
+
+    def report_row(
         self,
         control_mean,
         treatment_mean,
@@ -51,25 +189,24 @@ class BaseStatisticalTest(ABC):
         p_value: str | float = "-",
         left_ci: float | str = "-",
         right_ci: float | str = "-",
-    ) -> pd.DataFrame:
-        statistics_result = pd.DataFrame(
-            data={
-                "test_datetime": [pendulum.now().to_datetime_string()],
-                "model_version": [model_version],
-                "feature_name": [feature_name],
-                "feature_type": [feature_type],
-                "control_mean": [control_mean],
-                "treatment_mean": [treatment_mean],
-                "control_std": [control_std],
-                "treatment_std": [treatment_std],
-                "quantile_cut": [quantile_cut],
-                "test_name": [test_name],
-                "p_value": [p_value],
-                "left_ci": [left_ci],
-                "right_ci": [right_ci],
-                "statistics": [statistics],
-                "conclusion": [conclusion],
-            }
-        )
+    ) -> dict:
+        return {
+            "test_datetime": datetime.datetime.now().isoformat(sep=" ", timespec="seconds"),
+            "model_version": model_version,
+            "feature_name": feature_name,
+            "feature_type": feature_type,
+            "control_mean": control_mean,
+            "treatment_mean": treatment_mean,
+            "control_std": control_std,
+            "treatment_std": treatment_std,
+            "quantile_cut": quantile_cut,
+            "test_name": test_name,
+            "p_value": p_value,
+            "left_ci": left_ci,
+            "right_ci": right_ci,
+            "statistics": statistics,
+            "conclusion": conclusion,
+        }
 
-        return statistics_result
+    def dataframe_report(self, **kwargs) -> pd.DataFrame:
+        return pd.DataFrame([self.report_row(**kwargs)])
@@ -4,6 +4,8 @@ from .stat_tests.mannwhitney import MannWhitney
 from .stat_tests.wasserstein import Wasserstein
 from .stat_tests.kl_divergence import KLDivergence
 from .stat_tests.psi import PSI
+from pydrifter.base_classes.base_statistics import StatTestResult, results_to_frame
+from .runner import run_tests
 
 __all__ = [
     "TTest",
@@ -12,4 +14,7 @@ __all__ = [
     "Wasserstein",
     "KLDivergence",
     "PSI",
+    "StatTestResult",
+    "results_to_frame",
+    "run_tests",
 ]
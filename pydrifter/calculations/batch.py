@@ -0,0 +1,103 @@
+import numpy as np
+
+
+def _batch_doane_bins(control: np.ndarray, treatment: np.ndarray) -> np.ndarray:
+    n = control.shape[1] + treatment.shape[1]
+    if n <= 2:
+        return np.ones(control.shape[0], dtype=np.intp)
+
+    mean = (control.sum(axis=1) + treatment.sum(axis=1)) / n
+    control_dev = control - mean[:, None]
+    treatment_dev = treatment - mean[:, None]
+    m2 = (np.einsum("ij,ij->i", control_dev, control_dev) + np.einsum("ij,ij->i", treatment_dev, treatment_dev)) / n
+    m3 = (
+        np.einsum("ij,ij,ij->i", control_dev, control_dev, control_dev)
+        + np.einsum("ij,ij,ij->i", treatment_dev, treatment_dev, treatment_dev)
+    ) / n
+
+    sigma_g1 = np.sqrt(6.0 * (n - 2) / ((n + 1.0) * (n + 3)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        g1 = np.where(m2 > 0, m3 / m2 ** 1.5, 0.0)
+    nbins = np.ceil(1.0 + np.log2(n) + np.log2(1.0 + np.abs(g1) / sigma_g1)).astype(np.intp)
+    return np.maximum(nbins, 1)
+
+
+def _batch_histogram(data: np.ndarray, lo: np.ndarray, hi: np.ndarray, nbins: np.ndarray) -> np.ndarray:
+    n_features, max_bins = data.shape[0], int(nbins.max())
+    scale = nbins / (hi - lo)
+    idx = ((data - lo[:, None]) * scale[:, None]).astype(np.intp)
+    np.clip(idx, 0, nbins[:, None] - 1, out=idx)
+    # Shift every feature into its own block of bins so one bincount covers all rows
+    idx += (np.arange(n_features) * max_bins)[:, None]
+    return np.bincount(idx.ravel(), minlength=n_features * max_bins).reshape(n_features, max_bins)
+
+
+def _batch_fill_zeros(percents: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    min_percent = np.min(percents, axis=1, where=valid & (percents > 0), initial=np.inf)
+    fill = np.where(min_percent <= 0.0001, min_percent / 10**6, 0.0001)
+    np.maximum(percents, fill[:, None], out=percents)
+    return percents
+
+
+def batch_psi(control: np.ndarray, treatment: np.ndarray, nbins: int | None = None) -> np.ndarray:
+    """
+    Compute Population Stability Index for many features at once.
+
+    Both inputs are laid out feature-major: one row per feature, one column per sample.
+    Statistics, bin assignment and histograms are computed for all rows in vectorized passes.
+
+    Parameters
+    ----------
+    control : np.ndarray
+        Control samples with shape (n_features, n_control_samples).
+    treatment : np.ndarray
+        Treatment samples with shape (n_features, n_treatment_samples).
+    nbins : int, optional
+        Fixed number of bins for every feature. If None, Doane's rule is applied per feature,
+        same as in `PSI`.
+
+    Returns
+    -------
+    np.ndarray
+        PSI value per feature, shape (n_features,).
+
+    Raises
+    ------
+    ValueError
+        If the number of features differs between control and treatment.
+
+    Examples
+    --------
+    >>> psi_values = batch_psi(control_df[features].to_numpy().T, treatment_df[features].to_numpy().T)
+    """
+    control = np.atleast_2d(np.asarray(control, dtype=np.float64))
+    treatment = np.atleast_2d(np.asarray(treatment, dtype=np.float64))
+    if control.shape[0] != treatment.shape[0]:
+        raise ValueError(
+            f"Number of features should be equal in control and treatment ({control.shape[0]} != {treatment.shape[0]})"
+        )
+
+    lo = np.minimum(control.min(axis=1), treatment.min(axis=1))
+    hi = np.maximum(control.max(axis=1), treatment.max(axis=1))
+    if nbins is None:
+        bins = _batch_doane_bins(control, treatment)
+    else:
+        bins = np.full(control.shape[0], nbins, dtype=np.intp)
+
+    constant = lo == hi
+    lo[constant] -= 0.5
+    hi[constant] += 0.5
+    if nbins is None:
+        bins[constant] = 1
+
+    reference_percents = _batch_histogram(control, lo, hi, bins) / control.shape[1]
+    current_percents = _batch_histogram(treatment, lo, hi, bins) / treatment.shape[1]
+
+    # Rows with fewer bins than the widest one are padded; padding contributes zero PSI
+    valid = np.arange(reference_percents.shape[1]) < bins[:, None]
+    _batch_fill_zeros(reference_percents, valid)
+    _batch_fill_zeros(current_percents, valid)
+    reference_percents[~valid] = 1.0
+    current_percents[~valid] = 1.0
+
+    return np.sum((reference_percents - current_percents) * np.log(reference_percents / current_percents), axis=1)
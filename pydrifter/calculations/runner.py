@@ -0,0 +1,57 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from pydrifter.base_classes.base_statistics import BaseStatisticalTest, StatTestResult
+
+
+def _run_test(test: BaseStatisticalTest) -> StatTestResult:
+    return test()
+
+
+def run_tests(
+    tests: list[BaseStatisticalTest],
+    n_workers: int | None = None,
+    backend: str = "thread",
+) -> list[StatTestResult]:
+    """
+    Run prepared statistical tests concurrently.
+
+    NumPy and SciPy release the GIL in their heavy loops, so a thread pool scales well
+    for independent per-feature tests. A process pool is available for tests whose
+    work is mostly pure Python.
+
+    Parameters
+    ----------
+    tests : list of BaseStatisticalTest
+        Test instances ready to be called, e.g. `PSI(control_data=..., treatment_data=...)`.
+    n_workers : int, optional
+        Maximum number of workers. Defaults to the executor's own choice. With the process
+        backend the tests are split into one contiguous shard per worker.
+    backend : str, default="thread"
+        Either 'thread' or 'process'.
+
+    Returns
+    -------
+    list of StatTestResult
+        Results in the same order as `tests`.
+
+    Raises
+    ------
+    ValueError
+        If `backend` is not 'thread' or 'process'.
+
+    Example
+    -------
+    >>> results = run_tests([PSI(c[col], t[col], feature_name=col) for col in features], n_workers=4)
+    """
+    executors = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+    if backend not in executors:
+        raise ValueError(f"'backend' could be 'thread' or 'process' only, got '{backend}'")
+
+    with executors[backend](max_workers=n_workers) as executor:
+        if backend == "thread":
+            return list(executor.map(_run_test, tests))
+        # One shard of tests per worker process keeps pickling round-trips to a minimum
+        chunksize = max(1, math.ceil(len(tests) / (n_workers or os.cpu_count() or 1)))
+        return list(executor.map(_run_test, tests, chunksize=chunksize))
@@ -1,12 +1,227 @@
+import itertools
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+from scipy.special import gammaln
+from scipy.stats import kstwo
 
 
-def mean_bootstrap(data: np.ndarray, size: int = 1_000):
-    return np.array([float((np.random.choice(data, len(data), replace=True)).mean()) for _ in range(size)])
+_rng = np.random.default_rng()
 
-def calculate_statistics(data: np.array):
-    return {
-        "mean": data.mean(),
-        "std": data.std(),
-        "var": data.var()
-    }
+# Memory for one bootstrap batch (int64 indices plus the float32 gather) per worker
+_BOOTSTRAP_BATCH_BYTES = 32 * 2**20
+
+def _exact_bootstrap_means(data: np.ndarray, size: int) -> np.ndarray:
+    n = data.size
+    # Every distinct resample (a multiset of indices) with its multinomial probability
+    resamples = np.array(list(itertools.combinations_with_replacement(range(n), n)))
+    means = data[resamples].mean(axis=1)
+    counts = (resamples[:, :, None] == np.arange(n)).sum(axis=1)
+    probabilities = np.exp(gammaln(n + 1) - gammaln(counts + 1).sum(axis=1) - n * np.log(n))
+
+    # `size` evenly spaced quantiles of the exact distribution instead of random draws from it
+    order = np.argsort(means, kind="stable")
+    cumulative = np.cumsum(probabilities[order])
+    positions = np.searchsorted(cumulative, (np.arange(size) + 0.5) / size)
+    return means[order][np.minimum(positions, means.size - 1)]
+
+def _exact_bootstrap_fits(n: int, size: int) -> bool:
+    """Whether a sample of `n` values has at most `size` distinct resamples, C(2n - 1, n)."""
+    if n == 0 or size < 1:
+        return False
+    # Cheap log-count check first; the exact big integer is built only near the boundary
+    if gammaln(2 * n) - gammaln(n + 1) - gammaln(n) > math.log(size) + 1e-6:
+        return False
+    return math.comb(2 * n - 1, n) <= size
+
+def mean_bootstrap(
+    data: np.ndarray,
+    size: int = 1_000,
+    batch: int | None = None,
+    seed: int | None = None,
+    workers: int = 1,
+):
+    if _exact_bootstrap_fits(np.size(data), size):
+        # Fewer distinct resamples than draws: enumerate them exactly
+        return _exact_bootstrap_means(np.asarray(data, dtype=np.float64), size)
+    # float32 halves the bytes moved by the gather. Values are centred in float64 first, so the
+    # float32 rounding and accumulation error scales with the spread, not with the offset
+    data = np.asarray(data, dtype=np.float64)
+    center = float(data.mean())
+    data = (data - center).astype(np.float32)
+    out = np.empty(size)
+    # The mean of a resample is a dot product with equal weights: one BLAS matrix-vector
+    # product sums and scales every row of the gathered batch in a single pass
+    weights = np.full(data.size, 1 / data.size, dtype=np.float32)
+    # Resamples are drawn `batch` rows at a time, so peak memory is O(batch * n) rather than O(size * n).
+    # By default a batch fills a fixed byte budget: 8 bytes per index plus 4 per gathered value
+    if batch is None:
+        batch = max(1, _BOOTSTRAP_BATCH_BYTES // (12 * data.size))
+    starts = range(0, size, batch)
+    # Gather buffers are allocated once per thread and overwritten by every batch.
+    # `Generator.integers` has no `out=`, so the index array is the only per-batch allocation
+    buffers = threading.local()
+
+    def fill(start, rng):
+        stop = min(start + batch, size)
+        if not hasattr(buffers, "gathered"):
+            buffers.gathered = np.empty((min(batch, size), data.size), dtype=np.float32)
+        gathered = buffers.gathered[:stop - start]
+        idx = rng.integers(0, data.size, size=(stop - start, data.size))
+        # NumPy buffers `out=` in the default "raise" mode; indices are always in range, so "wrap" is a no-op
+        np.take(data, idx, out=gathered, mode="wrap")
+        np.matmul(gathered, weights, out=out[start:stop])
+
+    if seed is None and workers == 1:
+        for start in starts:
+            fill(start, _rng)
+        return out + center
+
+    # Every batch gets its own Philox stream spawned from one seed, so the result depends
+    # only on `seed` and `batch`, not on how batches are spread over the workers
+    rngs = [np.random.Generator(np.random.Philox(child)) for child in np.random.SeedSequence(seed).spawn(len(starts))]
+    if workers == 1:
+        for start, rng in zip(starts, rngs):
+            fill(start, rng)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(fill, starts, rngs))
+    return out + center
+
+def as_float(data: np.ndarray) -> np.ndarray:
+    data = np.asarray(data)
+    if data.dtype not in (np.float32, np.float64):
+        data = data.astype(np.float64)
+    return data
+
+def to_float32(data: np.ndarray, lo: float, hi: float) -> np.ndarray:
+    data = np.asarray(data)
+    # Only cast when float32 spacing over [lo; hi] is far below any plausible bin width;
+    # large offsets with a narrow spread (e.g. 1e7 +- 1) keep float64 so bins are not quantized
+    if data.dtype == np.float64 and np.spacing(np.float32(max(abs(lo), abs(hi)))) <= (hi - lo) * 2.0**-16:
+        return np.ascontiguousarray(data, dtype=np.float32)
+    return data
+
+def uniform_histogram(data: np.ndarray, lo: float, hi: float, nbins: int) -> np.ndarray:
+    data = as_float(data)
+    scale = nbins / (hi - lo)
+    # Scale in place so only one float temporary is allocated before the index cast
+    positions = np.subtract(data, data.dtype.type(lo))
+    positions *= scale
+    idx = positions.astype(np.intp)
+    np.clip(idx, 0, nbins - 1, out=idx)
+    return np.bincount(idx, minlength=nbins)
+
+def doane_bins(
+    control: np.ndarray,
+    treatment: np.ndarray,
+    lo: float | None = None,
+    hi: float | None = None,
+) -> tuple[float, float, int]:
+    control = as_float(control)
+    treatment = as_float(treatment)
+    n = control.size + treatment.size
+
+    if lo is None:
+        lo = min(control.min(), treatment.min())
+    if hi is None:
+        hi = max(control.max(), treatment.max())
+    if lo == hi:
+        return lo - 0.5, hi + 0.5, 1
+    if n <= 2:
+        return lo, hi, 1
+
+    # Moments are accumulated in float64 even when the samples are float32
+    mean = (control.sum(dtype=np.float64) + treatment.sum(dtype=np.float64)) / n
+    control_dev = control - control.dtype.type(mean)
+    treatment_dev = treatment - treatment.dtype.type(mean)
+    m2 = (np.square(control_dev).sum(dtype=np.float64) + np.square(treatment_dev).sum(dtype=np.float64)) / n
+    m3 = (
+        np.power(control_dev, 3).sum(dtype=np.float64) + np.power(treatment_dev, 3).sum(dtype=np.float64)
+    ) / n
+
+    sigma_g1 = np.sqrt(6.0 * (n - 2) / ((n + 1.0) * (n + 3)))
+    g1 = m3 / m2 ** 1.5
+    nbins = int(np.ceil(1.0 + np.log2(n) + np.log2(1.0 + np.abs(g1) / sigma_g1)))
+    return lo, hi, max(nbins, 1)
+
+def fill_zeros(percents: np.ndarray) -> np.ndarray:
+    min_percent = np.min(percents, where=percents > 0, initial=np.inf)
+    # The fill value never exceeds the smallest non-zero share, so max() only touches empty bins
+    np.maximum(percents, min_percent / 10**6 if min_percent <= 0.0001 else 0.0001, out=percents)
+    return percents
+
+def psi_from_counts(reference_counts: np.ndarray, current_counts: np.ndarray) -> float:
+    reference_percents = fill_zeros(np.asarray(reference_counts, dtype=np.float64) / np.sum(reference_counts))
+    current_percents = fill_zeros(np.asarray(current_counts, dtype=np.float64) / np.sum(current_counts))
+
+    # (p - q) * log(p / q) summed over bins, reusing the histogram buffers
+    percents_diff = reference_percents - current_percents
+    np.divide(reference_percents, current_percents, out=reference_percents)
+    np.log(reference_percents, out=reference_percents)
+    return float(np.dot(percents_diff, reference_percents))
+
+def psi_statistic(control: np.ndarray, treatment: np.ndarray, lo: float, hi: float, nbins: int) -> float:
+    return psi_from_counts(uniform_histogram(control, lo, hi, nbins), uniform_histogram(treatment, lo, hi, nbins))
+
+def kl_from_counts(reference_counts: np.ndarray, current_counts: np.ndarray) -> float:
+    reference_percents = fill_zeros(np.asarray(reference_counts, dtype=np.float64) / np.sum(reference_counts))
+    current_percents = fill_zeros(np.asarray(current_counts, dtype=np.float64) / np.sum(current_counts))
+
+    # Zero filling shifts the sums slightly above 1, renormalize as scipy.stats.entropy does
+    reference_percents /= reference_percents.sum()
+    current_percents /= current_percents.sum()
+
+    # sum(p * log(p / q)); every bin is positive after zero filling
+    np.divide(reference_percents, current_percents, out=current_percents)
+    np.log(current_percents, out=current_percents)
+    return float(np.dot(reference_percents, current_percents))
+
+def kl_statistic(control: np.ndarray, treatment: np.ndarray, lo: float, hi: float, nbins: int) -> float:
+    return kl_from_counts(uniform_histogram(control, lo, hi, nbins), uniform_histogram(treatment, lo, hi, nbins))
+
+def wasserstein_sorted(control_sorted: np.ndarray, treatment_sorted: np.ndarray) -> float:
+    n_control, n_treatment = control_sorted.size, treatment_sorted.size
+    if n_control == n_treatment:
+        # Equal sample sizes: the distance is the mean gap between matching order statistics.
+        # `abs` runs in place on the difference, so the kernel allocates a single temporary
+        gaps = np.subtract(control_sorted, treatment_sorted, dtype=np.float64)
+        np.abs(gaps, out=gaps)
+        return float(gaps.sum() / n_control)
+
+    all_values = np.concatenate([control_sorted, treatment_sorted])
+    # Two sorted runs: a stable sort only has to merge them
+    order = np.argsort(all_values, kind="stable")
+    deltas = np.diff(all_values[order])
+
+    # Empirical CDFs at every merged point; ties contribute zero-width deltas
+    control_count = np.cumsum(order[:-1] < n_control)
+    cdf_diff = control_count / n_control - (np.arange(1, all_values.size) - control_count) / n_treatment
+    np.abs(cdf_diff, out=cdf_diff)
+    return float(np.dot(cdf_diff, deltas))
+
+def wasserstein_binned(control: np.ndarray, treatment: np.ndarray, lo: float, hi: float, nbins: int) -> float:
+    if hi <= lo:
+        return 0.0
+    # Empirical CDFs on a uniform grid: O(n) bincounts instead of an O(n log n) sort
+    control_cdf = np.cumsum(uniform_histogram(control, lo, hi, nbins)) / control.size
+    treatment_cdf = np.cumsum(uniform_histogram(treatment, lo, hi, nbins)) / treatment.size
+    return float(np.abs(control_cdf - treatment_cdf).sum() * ((hi - lo) / nbins))
+
+def ks_sorted(control_sorted: np.ndarray, treatment_sorted: np.ndarray) -> tuple[float, float]:
+    n_control, n_treatment = control_sorted.size, treatment_sorted.size
+    if n_control == 0 or n_treatment == 0:
+        # Same as ks_2samp: nothing to compare
+        return np.nan, np.nan
+    all_values = np.concatenate([control_sorted, treatment_sorted])
+    cdf_diff = (
+        np.searchsorted(control_sorted, all_values, side="right") / n_control
+        - np.searchsorted(treatment_sorted, all_values, side="right") / n_treatment
+    )
+    # Two-sided D = max |F1 - F2|; abs also keeps identical samples at 0.0 rather than -0.0
+    statistic = float(np.abs(cdf_diff).max())
+    # Smirnov's asymptotic two-sided p-value, as ks_2samp(method="asymp")
+    en = n_control * n_treatment / (n_control + n_treatment)
+    p_value = float(np.clip(kstwo.sf(statistic, np.round(en)), 0, 1))
+    return statistic, p_value
@@ -1,51 +1,51 @@
 import dataclasses
 import numpy as np
-import pandas as pd
+from typing import ClassVar
 from scipy.stats import ks_2samp
-import matplotlib.pyplot as plt
-import pendulum
 
-from pydrifter.logger import create_logger
-from pydrifter.calculations.stat import calculate_statistics
-from pydrifter.base_classes.base_statistics import StatTestResult, BaseStatisticalTest
+from pydrifter.calculations.stat import ks_sorted
+from pydrifter.base_classes.base_statistics import StatTestResult, BaseStatisticalTest, FeatureStats
 
-logger = create_logger(name="kstest.py", level="info")
-
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class KolmogorovSmirnov(BaseStatisticalTest):
     control_data: np.ndarray
     treatment_data: np.ndarray
     feature_name: str = "UNKNOWN_FEATURE"
     alpha: float = 0.05
     q: bool | float = False
+    method: str = "asymp"
+    control_stats: FeatureStats | None = None
+    treatment_stats: FeatureStats | None = None
+    sorted_control: np.ndarray | None = None
+    sorted_treatment: np.ndarray | None = None
+
+    uses_sorted_data: ClassVar[bool] = True
 
     @property
     def __name__(self):
         return f"Kolmogorov-Smirnov test"
 
     def __call__(self) -> StatTestResult:
-        control = self._apply_quantile_cut(self.control_data)
-        treatment = self._apply_quantile_cut(self.treatment_data)
-
-        control_data_statistics = calculate_statistics(control)
-        treatment_data_statistics = calculate_statistics(treatment)
+        control = self._apply_quantile_cut(self.control_data, self.sorted_control)
+        treatment = self._apply_quantile_cut(self.treatment_data, self.sorted_treatment)
 
-        statistics, p_value = ks_2samp(control, treatment)
+        control_stats, treatment_stats = self._feature_stats(control, treatment)
 
-        if p_value >= self.alpha:
-            conclusion = "OK"
-            logger.info(f"{self.__name__} for '{self.feature_name}'".ljust(50, ".") + " ✅ OK")
+        # "asymp" avoids the exact p-value path that scipy's "auto" picks for samples up to 10k
+        if self.method == "asymp" and self.sorted_control is not None and self.sorted_treatment is not None:
+            statistics, p_value = ks_sorted(control, treatment)
         else:
-            conclusion = "FAILED"
-            logger.info(f"{self.__name__} for '{self.feature_name}'".ljust(50, ".") + " ⚠️ FAILED")
+            statistics, p_value = ks_2samp(control, treatment, method=self.method)
 
-        statistics_result = self.dataframe_report(
+        conclusion = self._conclude(failed=not p_value >= self.alpha)
+
+        statistics_result = self.report_row(
             feature_name=self.feature_name,
             feature_type="numerical",
-            control_mean=control_data_statistics["mean"],
-            treatment_mean=treatment_data_statistics["mean"],
-            control_std=control_data_statistics["std"],
-            treatment_std=treatment_data_statistics["std"],
+            control_mean=control_stats.mean,
+            treatment_mean=treatment_stats.mean,
+            control_std=control_stats.std,
+            treatment_std=treatment_stats.std,
             quantile_cut=self.q if self.q else False,
             p_value=p_value,
             test_name=self.__name__,
@@ -53,7 +53,7 @@ class KolmogorovSmirnov(BaseStatisticalTest):
             conclusion=conclusion,
         )
         return StatTestResult(
-            dataframe=statistics_result, value=p_value, conclusion=conclusion
+            row=statistics_result, value=p_value, conclusion=conclusion
         )
 
     def _ecdf(self, data):
@@ -62,7 +62,9 @@ class KolmogorovSmirnov(BaseStatisticalTest):
         return x, y
 
     def draw(self):
-        statistics, p_value = ks_2samp(self.control_data, self.treatment_data)
+        import matplotlib.pyplot as plt
+
+        statistics, p_value = ks_2samp(self.control_data, self.treatment_data, method=self.method)
         # Получаем ECDF
         x_x, x_y = self._ecdf(self.control_data)
         y_x, y_y = self._ecdf(self.treatment_data)
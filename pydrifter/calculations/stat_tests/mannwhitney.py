@@ -1,50 +1,46 @@
 import dataclasses
 import numpy as np
-import pandas as pd
+from typing import ClassVar
 from scipy.stats import mannwhitneyu
-import pendulum
 
-from pydrifter.logger import create_logger
-from pydrifter.calculations.stat import calculate_statistics
-from pydrifter.base_classes.base_statistics import StatTestResult, BaseStatisticalTest
+from pydrifter.base_classes.base_statistics import StatTestResult, BaseStatisticalTest, FeatureStats
 
-logger = create_logger(name="mannwhitney.py", level="info")
-
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class MannWhitney(BaseStatisticalTest):
     control_data: np.ndarray
     treatment_data: np.ndarray
     feature_name: str = "UNKNOWN_FEATURE"
     alpha: float = 0.05
     q: bool | float = False
+    control_stats: FeatureStats | None = None
+    treatment_stats: FeatureStats | None = None
+    sorted_control: np.ndarray | None = None
+    sorted_treatment: np.ndarray | None = None
+
+    # Ranking the pooled sample is much cheaper when both halves are already sorted
+    uses_sorted_data: ClassVar[bool] = True
 
     @property
     def __name__(self):
         return f"Mann-Whitney test"
 
     def __call__(self) -> StatTestResult:
-        control = self._apply_quantile_cut(self.control_data)
-        treatment = self._apply_quantile_cut(self.treatment_data)
+        control = self._apply_quantile_cut(self.control_data, self.sorted_control)
+        treatment = self._apply_quantile_cut(self.treatment_data, self.sorted_treatment)
 
-        control_data_statistics = calculate_statistics(control)
-        treatment_data_statistics = calculate_statistics(treatment)
+        control_stats, treatment_stats = self._feature_stats(control, treatment)
 
         statistics, p_value = mannwhitneyu(control, treatment)
 
-        if p_value >= self.alpha:
-            conclusion = "OK"
-            logger.info(f"{self.__name__} for '{self.feature_name}'".ljust(50, ".") + " ✅ OK")
-        else:
-            conclusion = "FAILED"
-            logger.info(f"{self.__name__} for '{self.feature_name}'".ljust(50, ".") + " ⚠️ FAILED")
+        conclusion = self._conclude(failed=not p_value >= self.alpha)
 
-        statistics_result = self.dataframe_report(
+        statistics_result = self.report_row(
             feature_name=self.feature_name,
             feature_type="numerical",
-            control_mean=control_data_statistics["mean"],
-            treatment_mean=treatment_data_statistics["mean"],
-            control_std=control_data_statistics["std"],
-            treatment_std=treatment_data_statistics["std"],
+            control_mean=control_stats.mean,
+            treatment_mean=treatment_stats.mean,
+            control_std=control_stats.std,
+            treatment_std=treatment_stats.std,
             quantile_cut=self.q if self.q else False,
             p_value=p_value,
             test_name=self.__name__,
@@ -52,5 +48,5 @@ class MannWhitney(BaseStatisticalTest):
             conclusion=conclusion,
         )
         return StatTestResult(
-            dataframe=statistics_result, value=p_value, conclusion=conclusion
+            row=statistics_result, value=p_value, conclusion=conclusion
         )
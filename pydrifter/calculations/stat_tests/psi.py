@@ -1,72 +1,105 @@
 import dataclasses
 import numpy as np
-import pandas as pd
-import pendulum
 
-from pydrifter.logger import create_logger
-from pydrifter.calculations.stat import calculate_statistics
-from pydrifter.base_classes.base_statistics import StatTestResult, BaseStatisticalTest
+from pydrifter.calculations.batch import batch_psi
+from pydrifter.calculations.stat import doane_bins, psi_from_counts, psi_statistic, to_float32
+from pydrifter.base_classes.base_statistics import StatTestResult, BaseStatisticalTest, FeatureStats
 
-logger = create_logger(name="psi.py", level="info")
-
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class PSI(BaseStatisticalTest):
     control_data: np.ndarray
     treatment_data: np.ndarray
     feature_name: str = "UNKNOWN_FEATURE"
     q: bool | float = False
+    control_stats: FeatureStats | None = None
+    treatment_stats: FeatureStats | None = None
+    sorted_control: np.ndarray | None = None
+    sorted_treatment: np.ndarray | None = None
 
     @property
     def __name__(self):
         return "Population Stability Index"
 
-    def __call__(self) -> StatTestResult:
-        control = self._apply_quantile_cut(self.control_data)
-        treatment = self._apply_quantile_cut(self.treatment_data)
+    @classmethod
+    def from_histograms(
+        cls,
+        control_hist: np.ndarray,
+        treatment_hist: np.ndarray,
+        feature_name: str = "UNKNOWN_FEATURE",
+        control_stats: FeatureStats | None = None,
+        treatment_stats: FeatureStats | None = None,
+        **kwargs,
+    ) -> StatTestResult:
+        """
+        Run the test on pre-aggregated bin counts instead of raw samples.
 
-        control_data_statistics = calculate_statistics(control)
-        treatment_data_statistics = calculate_statistics(treatment)
+        Both histograms must share the same bins, e.g. `StreamHist.as_histogram` with a common range.
+        Means and standard deviations are reported only if feature statistics are given.
+        """
+        test = cls(
+            control_data=np.empty(0),
+            treatment_data=np.empty(0),
+            feature_name=feature_name,
+            control_stats=control_stats,
+            treatment_stats=treatment_stats,
+            **kwargs,
+        )
+        return test._result(psi_from_counts(control_hist, treatment_hist), control_stats, treatment_stats)
 
-        bins = np.histogram_bin_edges(
-                pd.concat([control, treatment], axis=0).values, bins="doane"
+    @classmethod
+    def run_batch(
+        cls,
+        control_data: np.ndarray,
+        treatment_data: np.ndarray,
+        feature_names: list[str],
+        control_stats: list[FeatureStats] | None = None,
+        treatment_stats: list[FeatureStats] | None = None,
+        **kwargs,
+    ) -> list[StatTestResult]:
+        """
+        Run the test for many features at once with `batch_psi`.
+
+        Data is laid out feature-major, shape (n_features, n_samples). No quantile cut is applied,
+        since it would leave features with different sample counts.
+        """
+        psi_values = batch_psi(control_data, treatment_data)
+        control_stats = control_stats or [FeatureStats.from_data(row) for row in control_data]
+        treatment_stats = treatment_stats or [FeatureStats.from_data(row) for row in treatment_data]
+        return [
+            cls(control_data=np.empty(0), treatment_data=np.empty(0), feature_name=feature_name, **kwargs)._result(
+                psi_value, feature_control_stats, feature_treatment_stats
+            )
+            for feature_name, psi_value, feature_control_stats, feature_treatment_stats in zip(
+                feature_names, psi_values, control_stats, treatment_stats
             )
-        reference_percents = np.histogram(control, bins)[0] / len(control)
-        current_percents = np.histogram(treatment, bins)[0] / len(treatment)
+        ]
 
-        np.place(
-            reference_percents,
-            reference_percents == 0,
-            min(reference_percents[reference_percents != 0]) / 10**6
-            if min(reference_percents[reference_percents != 0]) <= 0.0001
-            else 0.0001,
-        )
-        np.place(
-            current_percents,
-            current_percents == 0,
-            min(current_percents[current_percents != 0]) / 10**6
-            if min(current_percents[current_percents != 0]) <= 0.0001
-            else 0.0001,
-        )
+    def __call__(self) -> StatTestResult:
+        control = self._apply_quantile_cut(self.control_data, self.sorted_control)
+        treatment = self._apply_quantile_cut(self.treatment_data, self.sorted_treatment)
 
-        psi_values = (reference_percents - current_percents) * np.log(
-            reference_percents / current_percents
-        )
-        psi_value = np.sum(psi_values)
+        control_stats, treatment_stats = self._feature_stats(control, treatment)
+
+        lo = min(control_stats.min, treatment_stats.min)
+        hi = max(control_stats.max, treatment_stats.max)
+        # Feature statistics come from the original data; only binning may run in float32
+        control, treatment = to_float32(control, lo, hi), to_float32(treatment, lo, hi)
+        lo, hi, nbins = doane_bins(control, treatment, lo=lo, hi=hi)
+        psi_value = psi_statistic(control, treatment, lo, hi, nbins)
+        return self._result(psi_value, control_stats, treatment_stats)
 
-        if psi_value < 0.1:
-            conclusion = "OK"
-            logger.info(f"{self.__name__} for '{self.feature_name}'".ljust(50, ".") + " ✅ OK")
-        else:
-            conclusion = "FAILED"
-            logger.info(f"{self.__name__} for '{self.feature_name}'".ljust(50, ".") + " ⚠️ FAILED")
+    def _result(
+        self, psi_value: float, control_stats: FeatureStats | None, treatment_stats: FeatureStats | None
+    ) -> StatTestResult:
+        conclusion = self._conclude(failed=not psi_value < 0.1)
 
-        statistics_result = self.dataframe_report(
+        statistics_result = self.report_row(
             feature_name=self.feature_name,
             feature_type="numerical",
-            control_mean=control_data_statistics["mean"],
-            treatment_mean=treatment_data_statistics["mean"],
-            control_std=control_data_statistics["std"],
-            treatment_std=treatment_data_statistics["std"],
+            control_mean=control_stats.mean if control_stats else "-",
+            treatment_mean=treatment_stats.mean if treatment_stats else "-",
+            control_std=control_stats.std if control_stats else "-",
+            treatment_std=treatment_stats.std if treatment_stats else "-",
             quantile_cut=self.q if self.q else False,
             test_name=self.__name__,
             statistics=psi_value,
@@ -74,5 +107,5 @@ class PSI(BaseStatisticalTest):
         )
 
         return StatTestResult(
-            dataframe=statistics_result, value=psi_value, conclusion=conclusion
+            row=statistics_result, value=psi_value, conclusion=conclusion
         )
@@ -1,17 +1,13 @@
 import dataclasses
+import sys
 import numpy as np
-import pandas as pd
-from scipy.stats import ttest_ind
+from scipy.stats import ttest_ind_from_stats
 import scipy.stats as sts
-import pendulum
 
-from pydrifter.logger import create_logger
-from pydrifter.calculations.stat import mean_bootstrap, calculate_statistics
-from pydrifter.base_classes.base_statistics import StatTestResult, BaseStatisticalTest
+from pydrifter.calculations.stat import mean_bootstrap
+from pydrifter.base_classes.base_statistics import StatTestResult, BaseStatisticalTest, FeatureStats
 
-logger = create_logger(name="ttest.py", level="info")
-
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class TTest(BaseStatisticalTest):
     control_data: np.ndarray
     treatment_data: np.ndarray
@@ -19,57 +15,112 @@ class TTest(BaseStatisticalTest):
     alpha: float = 0.05
     feature_name: str = "UNKNOWN_FEATURE"
     q: bool | float = False
+    control_stats: FeatureStats | None = None
+    treatment_stats: FeatureStats | None = None
+    sorted_control: np.ndarray | None = None
+    sorted_treatment: np.ndarray | None = None
+
+    # Test names keyed by `var`, built once per class rather than on every report row
+    _NAMES = {True: sys.intern("Student test"), False: sys.intern("Welch's test")}
 
     @property
     def __name__(self):
-        if self.var:
-            return f"Student test"
-        else:
-            return f"Welch's test"
+        return self._NAMES[bool(self.var)]
+
+    @classmethod
+    def run_batch(
+        cls,
+        control_data: np.ndarray,
+        treatment_data: np.ndarray,
+        feature_names: list[str],
+        control_stats: list[FeatureStats] | None = None,
+        treatment_stats: list[FeatureStats] | None = None,
+        **kwargs,
+    ) -> list[StatTestResult]:
+        """
+        Run the test for many features with a single vectorized `ttest_ind_from_stats` call.
+
+        Data is laid out feature-major, shape (n_features, n_samples). No quantile cut is applied,
+        since it would leave features with different sample counts.
+        """
+        control_data = np.asarray(control_data)
+        treatment_data = np.asarray(treatment_data)
+        template = cls(control_data=np.empty(0), treatment_data=np.empty(0), **kwargs)
+        control_stats = control_stats or [FeatureStats.from_data(row) for row in control_data]
+        treatment_stats = treatment_stats or [FeatureStats.from_data(row) for row in treatment_data]
+        statistics, p_values = ttest_ind_from_stats(
+            np.array([stats.mean for stats in control_stats]),
+            np.array([stats.std for stats in control_stats]),
+            control_data.shape[1],
+            np.array([stats.mean for stats in treatment_stats]),
+            np.array([stats.std for stats in treatment_stats]),
+            treatment_data.shape[1],
+            equal_var=template.var,
+        )
+        return [
+            dataclasses.replace(template, feature_name=feature_name)._result(
+                feature_statistics,
+                p_value,
+                feature_control_stats,
+                feature_treatment_stats,
+                control_data.shape[1],
+                treatment_data.shape[1],
+            )
+            for feature_name, feature_statistics, p_value, feature_control_stats, feature_treatment_stats in zip(
+                feature_names, statistics, p_values, control_stats, treatment_stats
+            )
+        ]
 
     def __call__(self) -> StatTestResult:
-        control = self._apply_quantile_cut(self.control_data)
-        treatment = self._apply_quantile_cut(self.treatment_data)
+        control = self._apply_quantile_cut(self.control_data, self.sorted_control)
+        treatment = self._apply_quantile_cut(self.treatment_data, self.sorted_treatment)
 
         # control = mean_bootstrap(control)
         # treatment = mean_bootstrap(treatment)
 
-        control_data_statistics = calculate_statistics(control)
-        treatment_data_statistics = calculate_statistics(treatment)
+        control_stats, treatment_stats = self._feature_stats(control, treatment)
 
-        statistics, p_value = ttest_ind(
-            control,
-            treatment,
+        # The moments are already known, so scipy does not need another pass over the samples
+        statistics, p_value = ttest_ind_from_stats(
+            control_stats.mean,
+            control_stats.std,
+            len(control),
+            treatment_stats.mean,
+            treatment_stats.std,
+            len(treatment),
             equal_var=self.var,
         )
+        return self._result(statistics, p_value, control_stats, treatment_stats, len(control), len(treatment))
 
-        var_control = control.var(ddof=1)
-        var_treatment = treatment.var(ddof=1)
+    def _result(
+        self,
+        statistics: float,
+        p_value: float,
+        control_stats: FeatureStats,
+        treatment_stats: FeatureStats,
+        control_size: int,
+        treatment_size: int,
+    ) -> StatTestResult:
+        var_control = control_stats.var
+        var_treatment = treatment_stats.var
 
         left_ci, right_ci = sts.norm.interval(
             confidence=0.95,
-            loc=control.mean() - treatment.mean(),
+            loc=control_stats.mean - treatment_stats.mean,
             scale=np.sqrt(
-                (var_control / len(control)) + (var_treatment / len(treatment))
+                (var_control / control_size) + (var_treatment / treatment_size)
             )
         )
 
-        if p_value >= self.alpha:
-            conclusion = "OK"
-            logger.info(
-                f"{self.__name__} for '{self.feature_name}'".ljust(50, ".") + " ✅ OK"
-            )
-        else:
-            conclusion = "FAILED"
-            logger.info(f"{self.__name__} for '{self.feature_name}'".ljust(50, ".") + " ⚠️ FAILED")
+        conclusion = self._conclude(failed=not p_value >= self.alpha)
 
-        statistics_result = self.dataframe_report(
+        statistics_result = self.report_row(
             feature_name=self.feature_name,
             feature_type="numerical",
-            control_mean=control_data_statistics["mean"],
-            treatment_mean=treatment_data_statistics["mean"],
-            control_std=control_data_statistics["std"],
-            treatment_std=treatment_data_statistics["std"],
+            control_mean=control_stats.mean,
+            treatment_mean=treatment_stats.mean,
+            control_std=control_stats.std,
+            treatment_std=treatment_stats.std,
             quantile_cut=self.q if self.q else False,
             p_value=p_value,
             test_name=self.__name__,
@@ -77,5 +128,5 @@ class TTest(BaseStatisticalTest):
             conclusion=conclusion,
         )
         return StatTestResult(
-            dataframe=statistics_result, value=p_value, conclusion=conclusion
+            row=statistics_result, value=p_value, conclusion=conclusion
         )
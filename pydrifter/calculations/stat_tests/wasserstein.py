@@ -1,53 +1,64 @@
 import dataclasses
 import numpy as np
-import pandas as pd
-from scipy.stats import wasserstein_distance
-import pendulum
+from typing import ClassVar
 
-from pydrifter.logger import create_logger
-from pydrifter.calculations.stat import calculate_statistics
-from pydrifter.base_classes.base_statistics import StatTestResult, BaseStatisticalTest
+from pydrifter.calculations.stat import wasserstein_binned, wasserstein_sorted
+from pydrifter.base_classes.base_statistics import StatTestResult, BaseStatisticalTest, FeatureStats
 
-logger = create_logger(name="wasserstein.py", level="info")
-
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class Wasserstein(BaseStatisticalTest):
     control_data: np.ndarray
     treatment_data: np.ndarray
     feature_name: str = "UNKNOWN_FEATURE"
     alpha: float = 0.1
     q: bool | float = False
+    control_stats: FeatureStats | None = None
+    treatment_stats: FeatureStats | None = None
+    sorted_control: np.ndarray | None = None
+    sorted_treatment: np.ndarray | None = None
+    nbins: int | None = None
+
+    uses_sorted_data: ClassVar[bool] = True
 
     @property
     def __name__(self):
         return f"Wasserstein distance"
 
     def __call__(self) -> StatTestResult:
-        control = self._apply_quantile_cut(self.control_data)
-        treatment = self._apply_quantile_cut(self.treatment_data)
-
-        control_data_statistics = calculate_statistics(control)
-        treatment_data_statistics = calculate_statistics(treatment)
+        # To compare one control with many windows, sort it once and pass it as `sorted_control`
+        control = self._apply_quantile_cut(self.control_data, self.sorted_control)
+        treatment = self._apply_quantile_cut(self.treatment_data, self.sorted_treatment)
+        control_stats, treatment_stats = self._feature_stats(control, treatment)
 
-        wd_result = wasserstein_distance(control, treatment)
+        if self.nbins:
+            # Approximate distance from CDFs on `nbins` equal-width bins, no sorting needed.
+            # The error is bounded by two bin widths and is usually far smaller
+            wd_result = wasserstein_binned(
+                control,
+                treatment,
+                lo=min(control_stats.min, treatment_stats.min),
+                hi=max(control_stats.max, treatment_stats.max),
+                nbins=self.nbins,
+            )
+        else:
+            if self.sorted_control is None:
+                control = np.sort(control)
+            if self.sorted_treatment is None:
+                treatment = np.sort(treatment)
+            wd_result = wasserstein_sorted(control, treatment)
 
-        norm = max(control_data_statistics["std"], 0.001)
+        norm = max(control_stats.std, 0.001)
         wd_result_norm = wd_result / norm
 
-        if wd_result_norm < self.alpha:
-            conclusion = "OK"
-            logger.info(f"{self.__name__} for '{self.feature_name}'".ljust(50, ".") + " ✅ OK")
-        else:
-            conclusion = "FAILED"
-            logger.info(f"{self.__name__} for '{self.feature_name}'".ljust(50, ".") + " ⚠️ FAILED")
+        conclusion = self._conclude(failed=not wd_result_norm < self.alpha)
 
-        statistics_result = self.dataframe_report(
+        statistics_result = self.report_row(
             feature_name=self.feature_name,
             feature_type="numerical",
-            control_mean=control_data_statistics["mean"],
-            treatment_mean=treatment_data_statistics["mean"],
-            control_std=control_data_statistics["std"],
-            treatment_std=treatment_data_statistics["std"],
+            control_mean=control_stats.mean,
+            treatment_mean=treatment_stats.mean,
+            control_std=control_stats.std,
+            treatment_std=treatment_stats.std,
             quantile_cut=self.q if self.q else False,
             test_name=self.__name__,
             statistics=wd_result_norm,
@@ -55,5 +66,5 @@ class Wasserstein(BaseStatisticalTest):
         )
 
         return StatTestResult(
-            dataframe=statistics_result, value=wd_result_norm, conclusion=conclusion
+            row=statistics_result, value=wd_result_norm, conclusion=conclusion
         )
@@ -0,0 +1,168 @@
+import dataclasses
+import heapq
+import numpy as np
+
+from pydrifter.base_classes.base_statistics import FeatureStats
+
+
+@dataclasses.dataclass
+class StreamHist:
+    """
+    Online histogram of Ben-Haim & Tom-Tov for data that does not fit in memory.
+
+    The histogram keeps at most `max_bins` centroids (value, count). Every `update` merges
+    a chunk of data into the centroids, so samples never have to be materialized at once.
+    Two histograms built on different workers can be combined with `merge`.
+
+    Parameters
+    ----------
+    max_bins : int, optional
+        Maximum number of centroids kept in memory. Default is 256.
+
+    Examples
+    --------
+    >>> control_hist, treatment_hist = StreamHist(), StreamHist()
+    >>> for chunk in pd.read_csv("control.csv", chunksize=1_000_000):
+    ...     control_hist.update(chunk["income"])
+    >>> lo, hi = min(control_hist.min, treatment_hist.min), max(control_hist.max, treatment_hist.max)
+    >>> PSI.from_histograms(control_hist.as_histogram(20, lo, hi), treatment_hist.as_histogram(20, lo, hi))
+    """
+    max_bins: int = 256
+    centroids: np.ndarray = dataclasses.field(default_factory=lambda: np.empty(0), init=False, repr=False)
+    counts: np.ndarray = dataclasses.field(default_factory=lambda: np.empty(0), init=False, repr=False)
+    total: int = dataclasses.field(default=0, init=False)
+    min: float = dataclasses.field(default=np.inf, init=False)
+    max: float = dataclasses.field(default=-np.inf, init=False)
+    _mean: float = dataclasses.field(default=0.0, init=False, repr=False)
+    _m2: float = dataclasses.field(default=0.0, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.max_bins < 2:
+            raise ValueError("'max_bins' should be at least 2")
+
+    def update(self, data: np.ndarray) -> "StreamHist":
+        """Add a chunk of samples to the histogram."""
+        data = np.asarray(data, dtype=np.float64).ravel()
+        if data.size == 0:
+            return self
+
+        mean = data.mean()
+        deviations = data - mean
+        self._combine_moments(data.size, mean, np.dot(deviations, deviations))
+        self.min = min(self.min, data.min())
+        self.max = max(self.max, data.max())
+
+        # Pre-compress the chunk into fine equal-width cells so the merge loop stays short
+        lo, hi = data.min(), data.max()
+        cells = 16 * self.max_bins
+        idx = ((data - lo) * (cells / (hi - lo))).astype(np.intp) if hi > lo else np.zeros(data.size, dtype=np.intp)
+        np.clip(idx, 0, cells - 1, out=idx)
+        counts = np.bincount(idx, minlength=cells).astype(np.float64)
+        sums = np.bincount(idx, weights=data, minlength=cells)
+        filled = counts > 0
+        self._merge_centroids(sums[filled] / counts[filled], counts[filled])
+        return self
+
+    def merge(self, other: "StreamHist") -> "StreamHist":
+        """Combine with a histogram built on another part of the data."""
+        self._combine_moments(other.total, other._mean, other._m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._merge_centroids(other.centroids, other.counts)
+        return self
+
+    def _combine_moments(self, count: int, mean: float, m2: float) -> None:
+        # Chan et al. parallel update of (count, mean, sum of squared deviations).
+        # Unlike raw sums of squares it does not cancel catastrophically on large offsets
+        if count == 0:
+            return
+        total = self.total + count
+        delta = mean - self._mean
+        self._mean += delta * count / total
+        self._m2 += m2 + delta ** 2 * self.total * count / total
+        self.total = total
+
+    def _merge_centroids(self, centroids: np.ndarray, counts: np.ndarray) -> None:
+        centroids = np.concatenate([self.centroids, centroids])
+        counts = np.concatenate([self.counts, counts])
+        order = np.argsort(centroids, kind="stable")
+        values, weights = list(centroids[order]), list(counts[order])
+        size = len(values)
+        if size <= self.max_bins:
+            self.centroids, self.counts = np.array(values), np.array(weights)
+            return
+
+        # Repeatedly join the two closest neighbours into their weighted mean.
+        # Neighbours are a linked list; stale heap entries are skipped via versions.
+        previous = list(range(-1, size - 1))
+        following = list(range(1, size + 1))
+        versions = [0] * size
+        alive = [True] * size
+        heap = [(values[i + 1] - values[i], i, 0, i + 1, 0) for i in range(size - 1)]
+        heapq.heapify(heap)
+
+        while size > self.max_bins:
+            _, left, left_version, right, right_version = heapq.heappop(heap)
+            if not (alive[left] and alive[right]) or versions[left] != left_version or versions[right] != right_version:
+                continue
+
+            weight = weights[left] + weights[right]
+            values[left] = (values[left] * weights[left] + values[right] * weights[right]) / weight
+            weights[left] = weight
+            versions[left] += 1
+            alive[right] = False
+            following[left] = following[right]
+            if following[left] < len(values):
+                previous[following[left]] = left
+            size -= 1
+
+            if previous[left] >= 0:
+                neighbour = previous[left]
+                heapq.heappush(heap, (values[left] - values[neighbour], neighbour, versions[neighbour], left, versions[left]))
+            if following[left] < len(values):
+                neighbour = following[left]
+                heapq.heappush(heap, (values[neighbour] - values[left], left, versions[left], neighbour, versions[neighbour]))
+
+        self.centroids = np.array([value for value, keep in zip(values, alive) if keep])
+        self.counts = np.array([weight for weight, keep in zip(weights, alive) if keep])
+
+    def _cumulative(self, points: np.ndarray) -> np.ndarray:
+        """Estimated number of samples <= each point (the `sum` procedure of Ben-Haim & Tom-Tov)."""
+        centroids, counts = self.centroids, self.counts
+        points = np.asarray(points, dtype=np.float64)
+        result = np.zeros(points.shape)
+        if centroids.size == 0:
+            return result
+        if centroids.size == 1:
+            return np.where(points >= centroids[0], counts[0], 0.0)
+
+        idx = np.clip(np.searchsorted(centroids, points, side="right") - 1, 0, centroids.size - 2)
+        left, right = centroids[idx], centroids[idx + 1]
+        left_count, right_count = counts[idx], counts[idx + 1]
+        fraction = np.clip((points - left) / (right - left), 0.0, 1.0)
+        point_count = left_count + (right_count - left_count) * fraction
+        preceding = np.concatenate([[0.0], np.cumsum(counts)])[idx]
+
+        result = preceding + left_count / 2 + (left_count + point_count) / 2 * fraction
+        result = np.where(points < centroids[0], 0.0, result)
+        return np.where(points >= centroids[-1], self.total, result)
+
+    def as_histogram(self, nbins: int, lo: float | None = None, hi: float | None = None) -> np.ndarray:
+        """Approximate sample counts in `nbins` equal-width bins over [lo; hi]."""
+        lo = self.min if lo is None else lo
+        hi = self.max if hi is None else hi
+        cumulative = self._cumulative(np.linspace(lo, hi, nbins + 1))
+        # Bins covering the whole observed range must hold every sample
+        if lo <= self.min:
+            cumulative[0] = 0.0
+        if hi >= self.max:
+            cumulative[-1] = self.total
+        return np.maximum(np.diff(cumulative), 0.0)
+
+    def stats(self) -> FeatureStats:
+        """Feature statistics of all samples seen so far."""
+        if self.total == 0:
+            return FeatureStats.empty()
+        # ddof=1 as in FeatureStats.from_data: a single sample has undefined variance
+        var = self._m2 / (self.total - 1) if self.total > 1 else np.float64(np.nan)
+        return FeatureStats(mean=self._mean, std=np.sqrt(var), var=var, min=self.min, max=self.max)
@@ -1,9 +1,13 @@
 from abc import ABC
 import dataclasses
-from tabulate import tabulate
-from typing import Union
+import functools
+import os
+from typing import TYPE_CHECKING, Union
 import numpy as np
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 @dataclasses.dataclass
 class TableConfig(ABC):
@@ -63,6 +67,45 @@ class TableConfig(ABC):
             if quantiles_cut > 1.0 or quantiles_cut < 0:
                 raise TypeError("`quantiles_cut` should be a in range [0;1]")
 
+    @functools.cached_property
+    def numerical_set(self) -> frozenset[str]:
+        """Numerical feature names as a set, for O(1) membership checks."""
+        return frozenset(self.numerical)
+
+    def to_soa(
+        self,
+        data: "pd.DataFrame",
+        dtype: np.dtype | None = np.float32,
+        columns: list[str] | None = None,
+    ) -> dict[str, np.ndarray]:
+        """
+        Extract numerical columns as contiguous arrays, one per feature.
+
+        Every column is materialized once, so tests read plain contiguous memory instead of
+        going through pandas for each (test, feature) pair.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            Frame holding the numerical features.
+        dtype : np.dtype, optional
+            Dtype of the arrays. Default is float32; None keeps the dtype of each column.
+        columns : list of str, optional
+            Columns to extract. Default is all numerical features.
+
+        Returns
+        -------
+        dict of str to np.ndarray
+            Contiguous array per column name.
+
+        Example
+        -------
+        >>> arrays = config.to_soa(df)
+        >>> matrix = np.stack(list(arrays.values()))  # (n_features, n_samples) for the batch tests
+        """
+        columns = self.numerical if columns is None else columns
+        return {column: np.ascontiguousarray(data[column].to_numpy(dtype=dtype)) for column in columns}
+
     def __repr__(self) -> str:
         """
         Return a human-readable summary of the TableConfig instance.
@@ -70,28 +113,47 @@ class TableConfig(ABC):
         Returns
         -------
         str
-            A formatted table containing configuration data.
+            One "parameter: value" line per configuration entry.
 
         Example
         -------
-        >>> print(drifter)
+        >>> print(config)
+        Target: NOT DEFINED
+        Categorical Features: WWW_REG_SHOP, SOURCE_REG
+        Numerical Features: ACTIVE_DAYS, TOTAL_SALE, WIN_COUNT, SALE_COUNT
+        Datetime Features: WWW_REG_START_DATE
+        NaN strategy: fill
+        Wrong datatypes strategy: fix
+        Quantiles cut: 0.99
+        """
+        return "\n".join(f"{name}: {value}" for name, value in self._rows())
+
+    def _repr_pretty_(self, printer, cycle) -> None:
+        # IPython and Jupyter display the boxed table
+        printer.text(self._table())
+
+    def _table(self) -> str:
+        """
+        Return the configuration as a boxed table.
+
+        Example
+        -------
+        >>> print(config._table())
         ╒══════════════════════╤════════════════════════════════════════════════╕
         │ Parameter            │ Value                                          │
         ╞══════════════════════╪════════════════════════════════════════════════╡
         │ Target               │ NOT DEFINED                                    │
         ├──────────────────────┼────────────────────────────────────────────────┤
         │ Categorical Features │ WWW_REG_SHOP, SOURCE_REG                       │
-        ├──────────────────────┼────────────────────────────────────────────────┤
-        │ Numerical Features   │ ACTIVE_DAYS, TOTAL_SALE, WIN_COUNT, SALE_COUNT │
-        ├──────────────────────┼────────────────────────────────────────────────┤
-        │ Datetime Features    │ WWW_REG_START_DATE                             │
-        ├──────────────────────┼────────────────────────────────────────────────┤
-        │ NaN strategy         │ fill                                           │
-        ├──────────────────────┼────────────────────────────────────────────────┤
-        │ quantiles_cut        │ 0.99                                           │
         ╘══════════════════════╧════════════════════════════════════════════════╛
         """
-        data = [
+        # tabulate is only imported when a boxed table is actually requested
+        from tabulate import tabulate
+
+        return tabulate(self._rows(), headers=["Parameter", "Value"], tablefmt="fancy_grid")
+
+    def _rows(self) -> list[list]:
+        return [
             ["Target", self.target],
             [
                 "Categorical Features",
@@ -109,8 +171,68 @@ class TableConfig(ABC):
             ["Wrong datatypes strategy", self.wrong_datatypes],
             ["Quantiles cut", self.quantiles_cut],
         ]
-        return tabulate(data, headers=["Parameter", "Value"], tablefmt="fancy_grid")
+
+    def show(self, pretty: bool = False) -> None:
+        """
+        Print the configuration.
+
+        Parameters
+        ----------
+        pretty : bool, default=False
+            If True, print a boxed table. Otherwise print the plain `repr`, one "parameter: value" line per row.
+
+        Example
+        -------
+        >>> config.show()
+        Target: NOT DEFINED
+        Categorical Features: gender, city
+        ...
+        """
+        print(self._table() if pretty else repr(self))
+
+
+@dataclasses.dataclass(frozen=True)
+class GlobalSettings:
+    """
+    Library-wide settings.
+
+    Use the module-level `GlobalConfig` instance, read once at import. It is immutable, so worker
+    threads and processes always see the same values. Override the defaults with environment
+    variables before importing pydrifter.
+
+    Parameters
+    ----------
+    bootstrap_size : int, optional
+        Number of bootstrap resamples. Default is 50 000, or `PYDRIFTER_BOOTSTRAP_SIZE` if set.
+
+    Example
+    -------
+    >>> from pydrifter import GlobalConfig
+    >>> GlobalConfig.bootstrap_size
+    50000
+    """
+    bootstrap_size: int = 50_000
+
+    @classmethod
+    def from_env(cls) -> "GlobalSettings":
+        """
+        Build settings from `PYDRIFTER_*` environment variables.
+
+        Raises
+        ------
+        ValueError
+            If `PYDRIFTER_BOOTSTRAP_SIZE` is not an integer.
+        """
+        settings = {}
+        bootstrap_size = os.getenv("PYDRIFTER_BOOTSTRAP_SIZE")
+        if bootstrap_size is not None:
+            try:
+                settings["bootstrap_size"] = int(bootstrap_size)
+            except ValueError:
+                raise ValueError(
+                    f"`PYDRIFTER_BOOTSTRAP_SIZE` should be an integer, got '{bootstrap_size}'"
+                ) from None
+        return cls(**settings)
 
 
-class GlobalConfig():
-    bootstrap_size = 50_000
+GlobalConfig = GlobalSettings.from_env()
@@ -1,21 +1,37 @@
 from abc import ABC
 import dataclasses
+import os
+import warnings
 import pandas as pd
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
 from pydrifter.config.table_data import TableConfig
 from typing import Callable, Type
 from tabulate import tabulate
-from ..auxiliaries import *
+from ..auxiliaries import custom_warning, format_table
 from ..logger import create_logger
 
-from pydrifter.base_classes.base_statistics import BaseStatisticalTest
+from pydrifter.base_classes.base_statistics import BaseStatisticalTest, FeatureStats, quantile_cut_sorted, results_to_frame, REPORT_COLUMNS
+from pydrifter.calculations.runner import run_tests
+from pydrifter.calculations.stat_tests.psi import PSI
+from pydrifter.calculations.stat_tests.ttest import TTest
 
 warnings.showwarning = custom_warning
 logger = create_logger(name="income.py", level="info")
 
 
+def _test_fields(test_class: Type[BaseStatisticalTest]) -> frozenset[str]:
+    # Shared per-feature inputs are passed only to tests declaring them, so user-defined
+    # tests with the plain (control_data, treatment_data, feature_name, q) signature keep working
+    if dataclasses.is_dataclass(test_class):
+        return frozenset(field.name for field in dataclasses.fields(test_class))
+    return frozenset()
+
+
+def _has_nan(data: pd.DataFrame) -> bool:
+    # Column by column, so the check stops at the first column with a missing value
+    return any(values.isna().any() for _, values in data.items())
+
+
 @dataclasses.dataclass
 class TableDrifter(ABC):
     data_control: pd.DataFrame
@@ -54,20 +70,29 @@ class TableDrifter(ABC):
                 raise TypeError(f"Wrong datatype '{self.data_treatment[column].dtype}' for numerical column '{column}'")
 
         selected_features = self.data_config.numerical + self.data_config.categorical + self.data_config.datetime
-        self.data_control = self.data_control[selected_features]
-        self.data_treatment = self.data_treatment[selected_features]
+        # Frames that already hold exactly the selected features are kept without a copy,
+        # so below they are only ever rebound, never written in place
+        if list(self.data_control.columns) != selected_features:
+            self.data_control = self.data_control[selected_features]
+        if list(self.data_treatment.columns) != selected_features:
+            self.data_treatment = self.data_treatment[selected_features]
 
         try:
-            for column in self.data_config.datetime:
-                self.data_control.loc[:, column] = pd.to_datetime(self.data_control.loc[:, column] )
-                self.data_treatment.loc[:, column] = pd.to_datetime(self.data_treatment.loc[:, column] )
+            if self.data_config.datetime:
+                self.data_control = self.data_control.assign(
+                    **{column: pd.to_datetime(self.data_control[column]) for column in self.data_config.datetime}
+                )
+                self.data_treatment = self.data_treatment.assign(
+                    **{column: pd.to_datetime(self.data_treatment[column]) for column in self.data_config.datetime}
+                )
         except Exception as e:
             raise ValueError(e)
 
-        if len(self.data_treatment) < 100 or len(self.data_control) < 100:
-            warnings.warn(f"data_control: {self.data_control.shape}")
-            warnings.warn(f"data_treatment: {self.data_treatment.shape}")
-            warnings.warn("Be careful with small amount of data. Some statistics may show incorrect results")
+        if min(len(self.data_control), len(self.data_treatment)) < 100:
+            warnings.warn(
+                f"data_control: {self.data_control.shape}, data_treatment: {self.data_treatment.shape}. "
+                "Be careful with small amount of data. Some statistics may show incorrect results"
+            )
 
         self.run_data_health()
 
@@ -139,7 +164,7 @@ class TableDrifter(ABC):
             logger.info("Number of columns in datasets:".ljust(50, ".") + " ✅ OK")
 
         # Cols names
-        if not all(self.data_control.columns == self.data_treatment.columns):
+        if not self.data_control.columns.equals(self.data_treatment.columns):
             raise ValueError(
                 "Control and treatment datasets must have the same column names in the same order."
             )
@@ -149,10 +174,10 @@ class TableDrifter(ABC):
         # Data types in cols
         control_dtypes = self.data_control.dtypes
         treatment_dtypes = self.data_treatment.dtypes
+        mismatched = control_dtypes.ne(treatment_dtypes)
         mismatched_types = {
             col: (control_dtypes[col], treatment_dtypes[col])
-            for col in self.data_control.columns
-            if control_dtypes[col] != treatment_dtypes[col]
+            for col in mismatched.index[mismatched]
         }
 
         if mismatched_types:
@@ -160,9 +185,9 @@ class TableDrifter(ABC):
             print(pd.DataFrame(mismatched_types, index=["control", "test"]))
             if self.data_config.wrong_datatypes == "fix":
                 try:
-                    for col in mismatched_types.keys():
-                        dtype = self.data_control.loc[:, col].dtype
-                        self.data_treatment.loc[:, col] = self.data_treatment.loc[:, col].astype(dtype)
+                    self.data_treatment = self.data_treatment.astype(
+                        {col: control_dtypes[col] for col in mismatched_types.keys()}
+                    )
                     logger.info("Mismatch in datatypes fixed:".ljust(50, ".") + " ✅ OK")
                 except Exception as e:
                     raise e
@@ -186,15 +211,12 @@ class TableDrifter(ABC):
                 logger.info("🗑️ Строки с пропусками удалены.")
 
             elif self.data_config.nan_strategy == "fill" and clean_data:
-                for column in self.data_treatment.columns:
-                    if self.data_treatment[column].isna().sum() > 0:
-                        if self.data_treatment[column].dtype in ['float64', 'int64']:
-                            fill_value = self.data_control[column].mean()
-                        else:
-                            fill_value = self.data_control[column].mode().iloc[0]
-                        self.data_treatment.loc[:, column] = self.data_treatment[
-                            column
-                        ].fillna(fill_value)
+                columns_with_nan = missing_with_values.index
+                numerical_columns = self.data_treatment[columns_with_nan].select_dtypes(include=["float64", "int64"]).columns
+                fill_values = self.data_control[numerical_columns].mean().to_dict()
+                for column in columns_with_nan.difference(numerical_columns):
+                    fill_values[column] = self.data_control[column].mode().iloc[0]
+                self.data_treatment = self.data_treatment.fillna(fill_values)
                 logger.info("🧯 Пропуски заполнены значениями из контрольного набора.")
 
     def __check_nan(self) -> None:
@@ -210,14 +232,16 @@ class TableDrifter(ABC):
         -------
         >>> drifter._TableDrifter__check_nan()
         """
-        if (self.data_control.isna().sum().sum()) != 0:
+        if _has_nan(self.data_control):
             raise ValueError("Please replace NaN first in data_control")
-        if (self.data_treatment.isna().sum().sum()) != 0:
+        if _has_nan(self.data_treatment):
             raise ValueError("Please replace NaN first in data_treatment")
 
     def run_statistics(
         self,
         show_result: bool = False,
+        n_jobs: int = 1,
+        dtype: np.dtype | None = None,
     ) -> str | pd.DataFrame:
         """
         Run statistical tests on control and treatment datasets.
@@ -228,6 +252,12 @@ class TableDrifter(ABC):
         ----------
         show_result : bool, default=False
             If True, prints the result as a formatted table. If False, returns DataFrames.
+        n_jobs : int, default=1
+            Number of threads running the (test, feature) pairs. -1 uses all CPU cores.
+        dtype : np.dtype, optional
+            Cast numerical columns to this dtype once before testing, e.g. `np.float32` to halve
+            memory traffic on large data. Feature statistics are still accumulated in float64.
+            By default columns keep their own dtype.
 
         Returns
         -------
@@ -242,60 +272,111 @@ class TableDrifter(ABC):
         Example
         -------
         >>> result, summary = drifter.run_statistics()
+        >>> result, summary = drifter.run_statistics(n_jobs=-1)
         """
 
         # self.run_data_health()
         self.__check_nan()
 
-        result_numerical = pd.DataFrame()
-
         features = self.data_config.numerical + self.data_config.categorical
+        numerical_features = [column for column in features if column in self.data_config.numerical_set]
+
+        # Nothing to test: return the report schema instead of failing on an empty frame
+        if not numerical_features or not self.tests:
+            return self.__store_results(pd.DataFrame(columns=REPORT_COLUMNS), show_result)
+
+        # Columns are extracted from the frames once instead of once per test
+        control_arrays = self.data_config.to_soa(self.data_control, dtype=dtype, columns=numerical_features)
+        treatment_arrays = self.data_config.to_soa(self.data_treatment, dtype=dtype, columns=numerical_features)
+        arrays = {column: (control_arrays[column], treatment_arrays[column]) for column in numerical_features}
+
+        # Sorting pays off only for the quantile cut and for tests working on sorted samples.
+        # Then each numerical column is sorted once and shared by all tests on that column
+        needs_sort = bool(self.data_config.quantiles_cut) or any(
+            getattr(test_name, "uses_sorted_data", False) for test_name in self.tests
+        )
+        if needs_sort:
+            sort_dtype = np.float64 if dtype is None else dtype
+            sorted_data = {
+                column: (
+                    np.sort(control.astype(sort_dtype, copy=False)),
+                    np.sort(treatment.astype(sort_dtype, copy=False)),
+                )
+                for column, (control, treatment) in arrays.items()
+            }
+            feature_stats = {
+                column: (
+                    FeatureStats.from_sorted(quantile_cut_sorted(sorted_control, self.data_config.quantiles_cut)),
+                    FeatureStats.from_sorted(quantile_cut_sorted(sorted_treatment, self.data_config.quantiles_cut)),
+                )
+                for column, (sorted_control, sorted_treatment) in sorted_data.items()
+            }
+        else:
+            sorted_data = {column: (None, None) for column in arrays}
+            feature_stats = {
+                column: (FeatureStats.from_data(control), FeatureStats.from_data(treatment))
+                for column, (control, treatment) in arrays.items()
+            }
 
         # Numerical tests
-        for test_name in self.tests:
-            for column in features:
-                if column in self.data_config.numerical:
-                    statistics_result = test_name(
-                        control_data=self.data_control[column],
-                        treatment_data=self.data_treatment[column],
+        if len(self.tests) == 1 and self.tests[0] in (PSI, TTest) and not self.data_config.quantiles_cut:
+            # A single batchable test without quantile cut: all features share one length, so they go as one batch
+            results = self.tests[0].run_batch(
+                np.stack([arrays[column][0] for column in numerical_features]),
+                np.stack([arrays[column][1] for column in numerical_features]),
+                feature_names=numerical_features,
+                control_stats=[feature_stats[column][0] for column in numerical_features],
+                treatment_stats=[feature_stats[column][1] for column in numerical_features],
+            )
+        else:
+            shared = {
+                column: {
+                    "control_stats": feature_stats[column][0],
+                    "treatment_stats": feature_stats[column][1],
+                    "sorted_control": sorted_data[column][0],
+                    "sorted_treatment": sorted_data[column][1],
+                }
+                for column in numerical_features
+            }
+            tests = []
+            for test_name in self.tests:
+                fields = _test_fields(test_name)
+                for column in numerical_features:
+                    tests.append(test_name(
+                        control_data=arrays[column][0],
+                        treatment_data=arrays[column][1],
                         feature_name=column,
                         q=self.data_config.quantiles_cut,
-                    )()
-                    result_numerical = pd.concat(
-                        (result_numerical, statistics_result.dataframe),
-                        axis=0,
-                        ignore_index=True,
-                    )
-                    result_numerical[
-                        [
-                            "control_mean",
-                            "treatment_mean",
-                            "control_std",
-                            "treatment_std",
-                            "statistics",
-                            "p_value",
-                        ]
-                    ] = result_numerical[[
-                        "control_mean",
-                        "treatment_mean",
-                        "control_std",
-                        "treatment_std",
-                        "statistics",
-                        "p_value",
-                    ]].round(4)
+                        **{key: value for key, value in shared[column].items() if key in fields},
+                    ))
+            if n_jobs == 1:
+                results = [test() for test in tests]
+            else:
+                results = run_tests(tests, n_workers=os.cpu_count() if n_jobs == -1 else n_jobs)
+
+        # Rows are plain dicts; the report frame is built once from all of them
+        result_numerical = results_to_frame(results)
+
+        # Columns mixing numbers with "-" placeholders are object dtype, which DataFrame.round skips
+        rounded_columns = ["control_mean", "treatment_mean", "control_std", "treatment_std", "statistics", "p_value"]
+        if not result_numerical.empty:
+            numbers = result_numerical[rounded_columns].apply(pd.to_numeric, errors="coerce").round(4)
+            result_numerical[rounded_columns] = numbers.where(numbers.notna(), result_numerical[rounded_columns])
 
         result = result_numerical.sort_values("conclusion", ascending=True).reset_index(drop=True)
         result["model_version"] = self.model_version
+        return self.__store_results(result, show_result)
+
+    def __store_results(self, result: pd.DataFrame, show_result: bool) -> tuple[pd.DataFrame, pd.DataFrame]:
         summary = result.groupby("test_name").agg({"conclusion": "value_counts"})
 
         self._result = result
         self._summary = summary
 
         if show_result:
-            print(tabulate(
-                summary,
-                headers=result_numerical.columns,
-                tablefmt="pretty",
+            print(format_table(
+                [[test_name, conclusion, count] for (test_name, conclusion), count in summary["conclusion"].items()],
+                headers=["test_name", "conclusion", "count"],
             ))
         return result, summary
 
@@ -324,6 +405,10 @@ class TableDrifter(ABC):
         >>> drifter.draw("age")
         >>> drifter.draw("salary", quantiles=[0.05, 0.95])
         """
+        # Plotting libraries are heavy to import and only needed here
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+
         if quantiles:
             if not isinstance(quantiles, list):
                 raise TypeError("'quantiles' should be list or None")
@@ -333,28 +418,14 @@ class TableDrifter(ABC):
                 raise ValueError("Quantiles should be in range [0;1]")
 
         if quantiles:
-            control = self.data_control[
-                (
-                    self.data_control[feature_name]
-                    > self.data_control[feature_name].quantile(quantiles[0])
-                )
-                & (
-                    self.data_control[feature_name]
-                    < self.data_control[feature_name].quantile(quantiles[1])
-                )
-            ][feature_name]
+            control = self.data_control[feature_name]
+            lower, upper = control.quantile(quantiles).to_numpy()
+            control = control[(control > lower) & (control < upper)]
             sns.kdeplot(control, color="dodgerblue", label=f"Control (avg={control.mean():.2f})")
 
-            test = self.data_treatment[
-                (
-                    self.data_treatment[feature_name]
-                    > self.data_treatment[feature_name].quantile(quantiles[0])
-                )
-                & (
-                    self.data_treatment[feature_name]
-                    < self.data_treatment[feature_name].quantile(quantiles[1])
-                )
-            ][feature_name]
+            test = self.data_treatment[feature_name]
+            lower, upper = test.quantile(quantiles).to_numpy()
+            test = test[(test > lower) & (test < upper)]
             sns.kdeplot(test, color="orange", label=f"Test (avg={test.mean():.2f})")
         else:
             sns.kdeplot(